@@ -2,6 +2,7 @@
 Main entry point for Intrusion Detection System
 """
 import sys
+import logging
 from pathlib import Path
 
 # Add src to path
@@ -14,6 +15,9 @@ from src.core.config import Config
 def main():
     """Main function"""
     
+    # Plain messages on stdout, interleaved with print output, for modules that log
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    
     print("="*60)
     print("INTRUSION DETECTION SYSTEM")
     print("Based on YOLO + DeepSORT")
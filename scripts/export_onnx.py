@@ -0,0 +1,34 @@
+"""
+One-off export of the YOLO weights to ONNX for the ONNX Runtime detector
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ultralytics import YOLO
+from src.core.config import Config
+
+
+def main():
+    """Export Config.YOLO_MODEL to Config.ONNX_MODEL"""
+    print(f"Exporting {Config.YOLO_MODEL} -> {Config.ONNX_MODEL}")
+
+    model = YOLO(Config.YOLO_MODEL)
+    exported = model.export(
+        format='onnx',
+        imgsz=Config.PROCESS_WIDTH,
+        simplify=True,
+        opset=13,
+        dynamic=Config.BATCH_DETECTION
+    )
+
+    if Path(exported).resolve() != Path(Config.ONNX_MODEL).resolve():
+        Path(exported).replace(Config.ONNX_MODEL)
+
+    print(f"✓ Saved ONNX model to {Config.ONNX_MODEL}")
+
+
+if __name__ == "__main__":
+    main()
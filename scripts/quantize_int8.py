@@ -0,0 +1,213 @@
+"""
+One-off static INT8 quantization of the exported ONNX model
+
+Calibrates on frames sampled from Config.VIDEO_PATH so activation ranges
+match the deployed camera. Run scripts/export_onnx.py first.
+
+The /model.22/ detect head stays FP32: its output Concat mixes box
+coordinates (0-640) and class scores (0-1), and one uint8 scale for both
+collapses the scores. The quantized model's detections are then compared to
+the FP32 model's; set Config.USE_INT8 = True only once that check passes.
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import cv2
+import numpy as np
+import onnx
+from onnxruntime.quantization import (
+    CalibrationDataReader,
+    CalibrationMethod,
+    QuantFormat,
+    QuantType,
+    quantize_static,
+)
+from src.core.config import Config
+from src.detector.preprocess import letterbox
+from src.detector.yolo_detector import YOLODetector
+
+CALIBRATION_FRAMES = 200
+PARITY_FRAMES = 50
+PARITY_IOU = 0.5
+PARITY_MIN_RATIO = 0.9  # Minimum INT8 recall and precision against FP32
+
+# Detect head; its cv2/cv3 branch convs quantize fine and stay INT8
+HEAD_PREFIX = "/model.22/"
+HEAD_QUANTIZED_PREFIXES = ("/model.22/cv2", "/model.22/cv3")
+
+
+class VideoCalibrationReader(CalibrationDataReader):
+    """Feeds letterboxed frames sampled evenly from a video, decoded on demand"""
+
+    def __init__(self, video_path: str, input_name: str, num_frames: int = CALIBRATION_FRAMES):
+        """
+        Args:
+            video_path: Video to sample calibration frames from
+            input_name: Model input name
+            num_frames: Number of frames to sample
+        """
+        self.cap = cv2.VideoCapture(video_path)
+        if not self.cap.isOpened():
+            raise ValueError(f"Cannot open video: {video_path}")
+        self.input_name = input_name
+
+        # Only the frame indices are kept; one blob is alive at a time
+        total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.indices = np.unique(
+            np.linspace(0, max(total_frames - 1, 0), num_frames).astype(int)
+        ).tolist()
+        self._pos = 0
+
+        print(f"Sampling {len(self.indices)} calibration frame(s) from {video_path}")
+
+    def get_next(self):
+        """Decode and letterbox the next calibration frame, None when exhausted"""
+        while self._pos < len(self.indices):
+            idx = self.indices[self._pos]
+            self._pos += 1
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+            ret, frame = self.cap.read()
+            if not ret:
+                continue
+            blob, _, _ = letterbox(frame, Config.PROCESS_WIDTH)
+            return {self.input_name: blob}
+        return None
+
+    def rewind(self):
+        """Restart iteration over the calibration frames"""
+        self._pos = 0
+
+    def release(self):
+        """Close the calibration video"""
+        self.cap.release()
+
+
+def head_nodes_to_exclude(model: onnx.ModelProto) -> list:
+    """
+    Names of the detect head nodes (DFL, Sigmoid, Mul, Concat, outputs) to keep FP32
+
+    Args:
+        model: Exported YOLOv8 ONNX model
+
+    Returns:
+        Node names for quantize_static's nodes_to_exclude
+    """
+    outputs = {o.name for o in model.graph.output}
+    names = [
+        node.name for node in model.graph.node
+        if (node.name.startswith(HEAD_PREFIX)
+            and not node.name.startswith(HEAD_QUANTIZED_PREFIXES))
+        or outputs.intersection(node.output)
+    ]
+    if not any(name.startswith(HEAD_PREFIX) for name in names):
+        raise ValueError(
+            f"No {HEAD_PREFIX} head nodes in {Config.ONNX_MODEL}; "
+            f"refusing to quantize the detect head (re-export with scripts/export_onnx.py)"
+        )
+    return names
+
+
+def _box_iou(a, b) -> float:
+    """IoU of two (x1, y1, x2, y2, ...) boxes"""
+    iw = min(a[2], b[2]) - max(a[0], b[0])
+    ih = min(a[3], b[3]) - max(a[1], b[1])
+    if iw <= 0 or ih <= 0:
+        return 0.0
+    inter = iw * ih
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def check_parity(video_path: str, num_frames: int = PARITY_FRAMES) -> bool:
+    """
+    Compare INT8 detections against FP32 on frames sampled from a video
+
+    Args:
+        video_path: Video to sample frames from
+        num_frames: Number of frames to compare
+
+    Returns:
+        True when INT8 recall and precision (IoU >= PARITY_IOU) both reach
+        PARITY_MIN_RATIO
+    """
+    fp32 = YOLODetector(model_path=Config.ONNX_MODEL)
+    int8 = YOLODetector(model_path=Config.INT8_MODEL)
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video: {video_path}")
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    indices = np.unique(np.linspace(0, max(total_frames - 1, 0), num_frames).astype(int))
+
+    matched = num_fp32 = num_int8 = 0
+    for idx in indices:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, int(idx))
+        ret, frame = cap.read()
+        if not ret:
+            continue
+        ref = fp32.detect_persons(frame)
+        det = int8.detect_persons(frame)
+        num_fp32 += len(ref)
+        num_int8 += len(det)
+
+        # Greedy one-to-one matching, each INT8 box used at most once
+        unused = list(det)
+        for box in ref:
+            ious = [_box_iou(box, other) for other in unused]
+            if ious and max(ious) >= PARITY_IOU:
+                unused.pop(int(np.argmax(ious)))
+                matched += 1
+    cap.release()
+
+    recall = matched / num_fp32 if num_fp32 else 1.0
+    precision = matched / num_int8 if num_int8 else 1.0
+    passed = num_fp32 > 0 and recall >= PARITY_MIN_RATIO and precision >= PARITY_MIN_RATIO
+
+    print(f"Parity vs FP32 on {len(indices)} frame(s): "
+          f"{num_fp32} FP32 / {num_int8} INT8 detections, "
+          f"recall {recall:.3f}, precision {precision:.3f}")
+    return passed
+
+
+def main():
+    """Quantize Config.ONNX_MODEL to Config.INT8_MODEL"""
+    if not Path(Config.ONNX_MODEL).exists():
+        raise FileNotFoundError(
+            f"ONNX model not found: {Config.ONNX_MODEL} "
+            f"(run 'python scripts/export_onnx.py' first)"
+        )
+
+    model = onnx.load(Config.ONNX_MODEL)
+    input_name = model.graph.input[0].name
+    nodes_to_exclude = head_nodes_to_exclude(model)
+    del model
+    reader = VideoCalibrationReader(Config.VIDEO_PATH, input_name)
+
+    print(f"Quantizing {Config.ONNX_MODEL} -> {Config.INT8_MODEL} "
+          f"({len(nodes_to_exclude)} head node(s) kept FP32)")
+    quantize_static(
+        Config.ONNX_MODEL,
+        Config.INT8_MODEL,
+        reader,
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        weight_type=QuantType.QInt8,
+        activation_type=QuantType.QUInt8,
+        calibrate_method=CalibrationMethod.Entropy,
+        nodes_to_exclude=nodes_to_exclude
+    )
+    reader.release()
+
+    print(f"✓ Saved INT8 model to {Config.INT8_MODEL}")
+
+    if not check_parity(Config.VIDEO_PATH):
+        print("✗ INT8 parity check FAILED; keep Config.USE_INT8 = False")
+        sys.exit(1)
+    print("✓ INT8 parity check passed; set Config.USE_INT8 = True to use it")
+
+
+if __name__ == "__main__":
+    main()
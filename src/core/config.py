@@ -10,12 +10,18 @@ class Config:
     PROJECT_ROOT = Path(__file__).parent.parent.parent
     DATA_DIR = PROJECT_ROOT / "data"
     ZONES_FILE = PROJECT_ROOT / "restricted_zones.json"
+    ZONES_PRETTY = False  # Indented zones file (for hand editing) instead of compact JSON
     
     YOLO_MODEL = "yolov8n.pt" # --> fast
     # YOLO_MODEL = "yolov8s.pt" # --> medium
     # YOLO_MODEL = "yolov8m.pt" # --> slow
+    ONNX_MODEL = str(PROJECT_ROOT / "yolov8n.onnx")  # scripts/export_onnx.py
+    INT8_MODEL = str(PROJECT_ROOT / "yolov8n_int8.onnx")  # scripts/quantize_int8.py
+    USE_INT8 = False  # Use INT8_MODEL; enable only after quantize_int8.py reports parity
 
     CONFIDENCE_THRESHOLD = 0.35 
+    NMS_IOU_THRESHOLD = 0.45
+    MAX_DETECTIONS = 30
     PERSON_CLASS_ID = 0
     
     PROCESS_WIDTH = 640  
@@ -29,6 +35,10 @@ class Config:
     VIDEO_PATH = str(PROJECT_ROOT / "test.mp4")
     WINDOW_NAME = "Intrusion Detection System"
     PROCESS_EVERY_N_FRAMES = 2  # Har 2-frameni process qilish
+    BATCH_DETECTION = False  # Detect all N frames in one batched call (N× inference, dynamic-batch export)
+    
+    ZONE_BACKEND = "numba"  # Batched point-in-zone test: "numba", "shapely" or "opencv"
+    ZONE_GRID_CELLS = 32  # Grid cells per axis for culling zones in batched queries
     
     ZONE_COLOR = (0, 0, 255)
     ZONE_THICKNESS = 3
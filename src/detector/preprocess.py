@@ -0,0 +1,84 @@
+"""
+Image preprocessing for the ONNX YOLO model
+"""
+import cv2
+import numpy as np
+from typing import Tuple
+
+
+class Letterbox:
+    """
+    Letterbox preprocessor writing into reusable buffers
+
+    Resize lands directly in a padded uint8 canvas, then BGR->RGB,
+    HWC->CHW and the 1/255 scaling happen in a single pass into the
+    caller's float32 input tensor. Buffers are only rebuilt when the
+    incoming frame size changes.
+    """
+
+    def __init__(self, size: int = 640, color: Tuple[int, int, int] = (114, 114, 114)):
+        """
+        Args:
+            size: Model input size
+            color: Padding color
+        """
+        self.size = size
+        self.color = color
+        self._canvas = np.empty((size, size, 3), dtype=np.uint8)
+        self._frame_shape = None
+
+    def _configure(self, h: int, w: int):
+        """Precompute resize geometry for a new frame size"""
+        self.ratio = min(self.size / h, self.size / w)
+        self._new_size = (int(round(w * self.ratio)), int(round(h * self.ratio)))
+        new_w, new_h = self._new_size
+        self.pad = ((self.size - new_w) // 2, (self.size - new_h) // 2)
+        pad_x, pad_y = self.pad
+
+        self._canvas[:] = self.color
+        self._roi = self._canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w]
+        self._frame_shape = (h, w)
+
+    def __call__(self, frame: np.ndarray, out: np.ndarray) -> Tuple[float, Tuple[int, int]]:
+        """
+        Preprocess frame into out
+
+        Args:
+            frame: Input frame (BGR)
+            out: (3, size, size) float32 destination
+
+        Returns:
+            (ratio, (pad_x, pad_y)) to map boxes back to frame coordinates
+        """
+        h, w = frame.shape[:2]
+        if (h, w) != self._frame_shape:
+            self._configure(h, w)
+
+        if self._new_size == (w, h):
+            np.copyto(self._roi, frame)
+        else:
+            cv2.resize(frame, self._new_size, dst=self._roi, interpolation=cv2.INTER_LINEAR)
+
+        # BGR->RGB and HWC->CHW are stride tricks; the multiply is the only pass
+        np.multiply(self._canvas[:, :, ::-1].transpose(2, 0, 1), np.float32(1 / 255.0), out=out)
+
+        return self.ratio, self.pad
+
+
+def letterbox(frame: np.ndarray, size: int = 640,
+              color: Tuple[int, int, int] = (114, 114, 114)) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """
+    Resize frame keeping aspect ratio and pad it to a square model input
+
+    Args:
+        frame: Input frame (BGR)
+        size: Model input size
+        color: Padding color
+
+    Returns:
+        (blob, ratio, (pad_x, pad_y)) where blob is a (1, 3, size, size)
+        float32 RGB tensor scaled to [0, 1]
+    """
+    blob = np.empty((1, 3, size, size), dtype=np.float32)
+    ratio, pad = Letterbox(size, color)(frame, blob[0])
+    return blob, ratio, pad
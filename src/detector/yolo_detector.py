@@ -1,90 +1,209 @@
 """
-YOLO-based person detector - OPTIMAL VERSION
+YOLO-based person detector - ONNX Runtime version
 """
-from ultralytics import YOLO
+import os
+import onnxruntime as ort
 import numpy as np
 import cv2
+from pathlib import Path
 from typing import List, Tuple
 from ..core.config import Config
+from .preprocess import Letterbox
 
 
 class YOLODetector:
     """YOLO-based person detection - optimized for real-time performance"""
-    
-    def __init__(self, model_path: str = None, confidence: float = None):
+
+    def __init__(self, model_path: str = None, confidence: float = None, batch_size: int = 1):
         """
         Initialize YOLO detector
-        
+
         Args:
-            model_path: Path to YOLO model
+            model_path: Path to exported ONNX model
             confidence: Confidence threshold
+            batch_size: Maximum frames per detect_batch call
         """
-        self.model_path = model_path or Config.YOLO_MODEL
+        self.model_path = model_path or self._default_model_path()
         self.confidence = confidence or Config.CONFIDENCE_THRESHOLD
-        
+        self.input_size = Config.PROCESS_WIDTH
+        self.batch_size = batch_size
+
+        # Per-call constants, bound once instead of Config lookups per frame
+        self._score_row = 4 + Config.PERSON_CLASS_ID
+        self._nms_iou = Config.NMS_IOU_THRESHOLD
+        self._max_det = Config.MAX_DETECTIONS
+
+        if not Path(self.model_path).exists():
+            raise FileNotFoundError(
+                f"ONNX model not found: {self.model_path} "
+                f"(run 'python scripts/export_onnx.py' first)"
+            )
+
         print(f"Loading YOLO model: {self.model_path}")
-        self.model = YOLO(self.model_path)
-        
+        sess_options = ort.SessionOptions()
+        # Leave two cores for the reader/display threads in the pipeline
+        sess_options.intra_op_num_threads = max(1, (os.cpu_count() or 1) - 2)
+        sess_options.inter_op_num_threads = 1
+        sess_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.sess = ort.InferenceSession(
+            self.model_path,
+            sess_options,
+            providers=['CPUExecutionProvider']
+        )
+        self.input_name = self.sess.get_inputs()[0].name
+        self.output_name = self.sess.get_outputs()[0].name
+
+        model_batch = self.sess.get_inputs()[0].shape[0]
+        if batch_size > 1 and isinstance(model_batch, int) and model_batch != batch_size:
+            raise ValueError(
+                f"Model {self.model_path} has a fixed batch size of {model_batch} "
+                f"(re-export with Config.BATCH_DETECTION = True for dynamic batches)"
+            )
+
+        # Reused every frame by the fused preprocessor, one slot per batched frame
+        self._letterbox = Letterbox(self.input_size)
+        self._input = np.zeros((batch_size, 3, self.input_size, self.input_size), dtype=np.float32)
+        self._slot_meta = [None] * batch_size
+
         print("Warming up model...")
-        dummy = np.zeros((640, 640, 3), dtype=np.uint8)
-        self.model.predict(dummy, verbose=False)
-        
+        output = self.sess.run(None, {self.input_name: self._input})[0]
+        self._output_shape = output.shape[1:]
+
+        # Input/output buffers are bound once per batch size (see _binding_for):
+        # runs need no feed dict and ORT writes predictions in place
+        self._bindings = {}
+        self._outputs = {}
+
         print("✓ YOLO model ready!")
         print(f"  Model: {self.model_path}")
         print(f"  Confidence: {self.confidence}")
-    
-    def detect_persons(self, frame: np.ndarray) -> List[Tuple[int, int, int, int, float]]:
+
+    @staticmethod
+    def _default_model_path() -> str:
+        """INT8 model if enabled and quantized, FP32 export otherwise"""
+        if Config.USE_INT8 and Path(Config.INT8_MODEL).exists():
+            return Config.INT8_MODEL
+        return Config.ONNX_MODEL
+
+    def _binding_for(self, count: int):
+        """IOBinding running the first count input slots, created on first use"""
+        binding = self._bindings.get(count)
+        if binding is None:
+            output = np.empty((count,) + self._output_shape, dtype=np.float32)
+            binding = self.sess.io_binding()
+            binding.bind_cpu_input(self.input_name, self._input[:count])
+            binding.bind_output(
+                name=self.output_name,
+                device_type='cpu',
+                device_id=0,
+                element_type=np.float32,
+                shape=list(output.shape),
+                buffer_ptr=output.ctypes.data
+            )
+            self._bindings[count] = binding
+            self._outputs[count] = output
+        return binding
+
+    def preprocess(self, frame: np.ndarray, slot: int = 0, scale: float = 1.0):
+        """
+        Preprocess frame into one input slot for a later detect_batch call
+
+        Args:
+            frame: Input frame (BGR)
+            slot: Batch slot to fill (0 <= slot < batch_size)
+            scale: Factor the caller already downscaled frame by; boxes are
+                returned (and size-filtered) at the original resolution
+        """
+        h, w = frame.shape[:2]
+        ratio, pad = self._letterbox(frame, self._input[slot])
+        self._slot_meta[slot] = (ratio * scale, pad, w / scale, h / scale)
+
+    def detect_batch(self, count: int) -> List[List[Tuple[int, int, int, int, float]]]:
+        """
+        Run the model once over the first count preprocessed slots
+
+        Returns:
+            One detection list per slot, in slot order
+        """
+        self.sess.run_with_iobinding(self._binding_for(count))
+        output = self._outputs[count]
+
+        return [self._postprocess(output[i], *self._slot_meta[i]) for i in range(count)]
+
+    def detect_persons(self, frame: np.ndarray, scale: float = 1.0) -> List[Tuple[int, int, int, int, float]]:
         """
         Detect persons in frame - FAST & ACCURATE
-        
+
         Args:
             frame: Input frame (BGR)
-        
+            scale: Factor the caller already downscaled frame by; boxes are
+                returned (and size-filtered) at the original resolution
+
         Returns:
             List of detections: [(x1, y1, x2, y2, confidence), ...]
         """
-        results = self.model.predict(
-            frame,
-            verbose=False,
-            conf=self.confidence,
-            iou=0.45,  
-            classes=[Config.PERSON_CLASS_ID],
-            max_det=30,  
-            imgsz=Config.PROCESS_WIDTH,  
-            device='cpu',
-            half=False,
-            augment=False,  
-            agnostic_nms=False
-        )
-        
-        detections = []
-        
-        for result in results:
-            boxes = result.boxes
-            
-            if boxes is None or len(boxes) == 0:
-                continue
-            
-            for box in boxes:
-                # Confidence
-                conf = float(box.conf[0])
-                
-                # Bbox coordinates
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
-                
-                # Size validation
-                width = x2 - x1
-                height = y2 - y1
-                
-                # Minimum size filter
-                if width < 20 or height < 40:
-                    continue
-                
-                aspect_ratio = height / max(width, 1)
-                if aspect_ratio < 1.0 or aspect_ratio > 5.0:
-                    continue
-                
-                detections.append((x1, y1, x2, y2, conf))
-        
-        return detections
\ No newline at end of file
+        self.preprocess(frame, 0, scale)
+        return self.detect_batch(1)[0]
+
+    def _postprocess(self, pred: np.ndarray, ratio: float, pad: Tuple[int, int],
+                     w: float, h: float) -> List[Tuple[int, int, int, int, float]]:
+        """
+        Decode one image's predictions into person detections
+
+        Args:
+            pred: (4 + num_classes, num_anchors) raw model output
+            ratio: Letterbox ratio relative to the original frame
+            pad: Letterbox (pad_x, pad_y)
+            w, h: Original frame size
+
+        Returns:
+            List of detections: [(x1, y1, x2, y2, confidence), ...]
+        """
+        pad_x, pad_y = pad
+
+        # Person class only
+        scores = pred[self._score_row]
+        keep = scores > self.confidence
+        if not keep.any():
+            return []
+
+        cx, cy, bw, bh = pred[:4, keep]
+        scores = scores[keep]
+
+        # Letterbox space -> original frame xyxy, clipped to frame
+        boxes = np.stack([
+            (cx - bw / 2 - pad_x) / ratio,
+            (cy - bh / 2 - pad_y) / ratio,
+            (cx + bw / 2 - pad_x) / ratio,
+            (cy + bh / 2 - pad_y) / ratio
+        ], axis=1)
+        np.clip(boxes[:, 0::2], 0, w, out=boxes[:, 0::2])
+        np.clip(boxes[:, 1::2], 0, h, out=boxes[:, 1::2])
+        boxes = boxes.astype(np.int32)
+
+        # Size validation + aspect ratio filter as one mask
+        widths = boxes[:, 2] - boxes[:, 0]
+        heights = boxes[:, 3] - boxes[:, 1]
+        aspect_ratios = heights / np.maximum(widths, 1)
+        valid = ((widths >= 20) & (heights >= 40) &
+                 (aspect_ratios >= 1.0) & (aspect_ratios <= 5.0))
+        if not valid.any():
+            return []
+
+        boxes = boxes[valid]
+        scores = scores[valid]
+        xywh = boxes.copy()
+        xywh[:, 2:] -= xywh[:, :2]
+
+        # Cap the kept boxes after suppression (top_k would cap NMS input,
+        # dropping people whose boxes rank below a crowd's duplicates)
+        indices = np.array(cv2.dnn.NMSBoxes(
+            xywh.tolist(),
+            scores.tolist(),
+            self.confidence,
+            self._nms_iou
+        ), dtype=np.intp).reshape(-1)[:self._max_det]
+
+        x1, y1, x2, y2 = boxes[indices].T.tolist()
+        return list(zip(x1, y1, x2, y2, scores[indices].tolist()))
\ No newline at end of file
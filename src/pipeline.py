@@ -3,13 +3,20 @@ Main processing pipeline for intrusion detection - OPTIMIZED
 """
 import cv2
 import numpy as np
+import threading
 import time
+from queue import Queue, Empty, Full
 from typing import Optional
 from .detector import YOLODetector
 from .tracker import DeepSORTTracker
 from .zones import ZoneManager
 from .core.config import Config
-from .utils import get_bbox_bottom_center, draw_bbox, draw_alarm, Timer
+from .utils import get_bboxes_bottom_center, draw_bbox, draw_alarm, Timer
+
+# Queue markers: video was rewound, frame numbering starts over. _REWIND is
+# a user restart, so frames queued from the old position are dropped too.
+_RESTART = object()
+_REWIND = object()
 
 
 class IntrusionDetectionPipeline:
@@ -22,7 +29,10 @@ class IntrusionDetectionPipeline:
         print("="*60)
         
         # Components
-        self.detector = YOLODetector()
+        self._batch_detection = Config.BATCH_DETECTION
+        self.detector = YOLODetector(
+            batch_size=Config.PROCESS_EVERY_N_FRAMES if self._batch_detection else 1
+        )
         self.tracker = DeepSORTTracker(
             max_age=Config.MAX_AGE,
             min_hits=Config.MIN_HITS,
@@ -37,12 +47,31 @@ class IntrusionDetectionPipeline:
         
         # Frame tracking
         self.frame_count = 0
-        self.last_tracks = []  
+        self.last_tracks = np.empty((0, 5), dtype=np.int32)
+        self._small_frame = None  # Reused detector-resolution buffer
+        self._batch_count = 0  # Frames preprocessed into the detector batch
+        self._mask_shape = None  # Frame size the zone mask was prepared for
+        
+        # Per-frame constants, bound once instead of Config lookups per frame
+        self._n = Config.PROCESS_EVERY_N_FRAMES
+        self._process_width = Config.PROCESS_WIDTH
+        self._bbox_color_ok = Config.BBOX_COLOR
+        self._bbox_color_bad = Config.ALARM_COLOR
         
         # Performance tracking
-        self.fps_history = []
+        self._fps_ema = 0.0
         self.last_time = time.time()
         
+        # Stats panel background, blended over a fixed ROI each frame
+        # (151 rows: filled cv2.rectangle corners are inclusive)
+        self._stats_overlay = np.zeros((151, 280, 3), dtype=np.uint8)
+        self._build_stats_labels()
+        
+        # Thread coordination (see run)
+        self._stop_event = threading.Event()
+        self._pause_event = threading.Event()
+        self._restart_event = threading.Event()
+        
         print("✓ Pipeline initialized successfully!")
         print("="*60 + "\n")
     
@@ -83,20 +112,42 @@ class IntrusionDetectionPipeline:
         current_time = time.time()
         fps = 1.0 / max(current_time - self.last_time, 0.001)
         self.last_time = current_time
-        self.fps_history.append(fps)
-        if len(self.fps_history) > 30:
-            self.fps_history.pop(0)
-        avg_fps = sum(self.fps_history) / len(self.fps_history)
+        # Exponential moving average, seeded with the first sample
+        if self._fps_ema == 0.0:
+            self._fps_ema = fps
+        else:
+            self._fps_ema = 0.9 * self._fps_ema + 0.1 * fps
+        
+        # Zone lookups become a mask read once the frame size is known
+        if self._mask_shape != frame.shape[:2]:
+            self._mask_shape = frame.shape[:2]
+            self.zone_manager.prepare_mask(*self._mask_shape)
         
-        # Selective processing - har N-frameda detect qilish
-        should_detect = (self.frame_count % Config.PROCESS_EVERY_N_FRAMES == 0) or force_detect
+        n = self._n
+        
+        if self._batch_detection:
+            # Preprocess every frame into its batch slot, detect all N at once
+            small, scale = self._downscale(frame)
+            self.detector.preprocess(small, self._batch_count, scale)
+            self._batch_count += 1
+            should_detect = self._batch_count == n or force_detect
+        else:
+            # Selective processing - har N-frameda detect qilish
+            should_detect = (self.frame_count % n == 0) or force_detect
         
         if should_detect:
-            # 1. Detect persons
-            detections = self.detector.detect_persons(frame)
+            if self._batch_detection:
+                # 1. Detect persons in all buffered frames, one model call
+                batch_detections = self.detector.detect_batch(self._batch_count)
+                self._batch_count = 0
+            else:
+                # 1. Detect persons (on a downscaled copy, boxes come back full-res)
+                small, scale = self._downscale(frame)
+                batch_detections = [self.detector.detect_persons(small, scale)]
             
-            # 2. Track persons
-            tracks = self.tracker.update(detections)
+            # 2. Track persons, frame by frame in order
+            for detections in batch_detections:
+                tracks = self.tracker.update(detections)
             
             # Cache for next frames
             self.last_tracks = tracks
@@ -105,28 +156,25 @@ class IntrusionDetectionPipeline:
             tracks = self.last_tracks
         
         # 3. Check intrusions
-        current_intruders = set()
-        
-        for track in tracks:
-            x1, y1, x2, y2, track_id = track
-            
-            # Get bottom center point (more stable for people)
-            point = get_bbox_bottom_center((x1, y1, x2, y2))
-            
-            # Check if in restricted zone
-            in_zone = self.zone_manager.is_point_in_any_zone(point)
+        # Bottom center points (more stable for people), tested in one batch
+        points = get_bboxes_bottom_center(tracks)
+        in_zone_mask = self.zone_manager.contains_points(points.astype(np.float32))
+        current_intruders = set(tracks[in_zone_mask, 4].tolist())
+        
+        # Red if in zone, green otherwise
+        colors = np.where(in_zone_mask[:, None], self._bbox_color_bad, self._bbox_color_ok)
+        
+        for (x1, y1, x2, y2, track_id), point, color in zip(
+                tracks.tolist(), points.tolist(), colors.tolist()):
+            point = tuple(point)
+            color = tuple(color)
             
-            # Draw bbox (red if in zone, green otherwise)
-            color = (0, 0, 255) if in_zone else (0, 255, 0)
+            # Draw bbox
             draw_bbox(frame, (x1, y1, x2, y2), track_id, color)
             
             # Draw tracking point
             cv2.circle(frame, point, 6, color, -1)
             cv2.circle(frame, point, 8, (255, 255, 255), 2)
-            
-            # Track intruders
-            if in_zone:
-                current_intruders.add(track_id)
         
         # 4. Update alarm state
         self._update_alarm_state(current_intruders)
@@ -144,10 +192,30 @@ class IntrusionDetectionPipeline:
                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
         
         # 7. Draw stats
-        self._draw_stats(frame, len(tracks), len(current_intruders), avg_fps)
+        self._draw_stats(frame, len(tracks), len(current_intruders), self._fps_ema)
         
         return frame
     
+    def _downscale(self, frame: np.ndarray):
+        """
+        Resize frame to the detection width (Config.PROCESS_WIDTH)
+        
+        Returns:
+            (small_frame, scale); frames already narrow enough are returned as-is
+        """
+        h, w = frame.shape[:2]
+        process_width = self._process_width
+        scale = process_width / w
+        if scale >= 1.0:
+            return frame, 1.0
+        
+        size = (process_width, int(round(h * scale)))
+        if self._small_frame is None or self._small_frame.shape[:2] != (size[1], size[0]):
+            self._small_frame = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        
+        cv2.resize(frame, size, dst=self._small_frame, interpolation=cv2.INTER_LINEAR)
+        return self._small_frame, scale
+    
     def _update_alarm_state(self, current_intruders: set):
         """Update alarm state based on current intruders"""
         if len(current_intruders) > 0:
@@ -182,35 +250,58 @@ class IntrusionDetectionPipeline:
         """Draw statistics on frame"""
         h, w = frame.shape[:2]
         
-        # Semi-transparent background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (w - 280, 0), (w, 150), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+        # Semi-transparent background, blended in place over the panel only
+        panel = frame[0:151, max(w - 280, 0):w]
+        overlay = self._stats_overlay[:panel.shape[0], :panel.shape[1]]
+        cv2.addWeighted(overlay, 0.7, panel, 0.3, 0, dst=panel)
         
-        # Draw stats
+        # Static labels, pre-rasterized in _build_stats_labels
+        labels, mask = self._stats_labels[intruders > 0]
+        pw = panel.shape[1]
+        np.copyto(panel, labels[:panel.shape[0], 280 - pw:], where=mask[:panel.shape[0], 280 - pw:])
+        
+        # Draw values
         font = cv2.FONT_HERSHEY_SIMPLEX
-        y_offset = 30
+        value_x = [w - 270 + label_w for label_w in self._stats_label_widths]
         
         # FPS
-        cv2.putText(frame, f"FPS: {fps:.1f}", (w - 270, y_offset),
+        cv2.putText(frame, f"{fps:.1f}", (value_x[0], 30),
                    font, 0.7, (0, 255, 0), 2)
-        y_offset += 35
         
         # Persons
-        cv2.putText(frame, f"Persons: {total_persons}", (w - 270, y_offset),
+        cv2.putText(frame, f"{total_persons}", (value_x[1], 65),
                    font, 0.7, (255, 255, 255), 2)
-        y_offset += 35
         
         # Intruders
         color = (0, 0, 255) if intruders > 0 else (0, 255, 0)
-        cv2.putText(frame, f"Intruders: {intruders}", (w - 270, y_offset),
+        cv2.putText(frame, f"{intruders}", (value_x[2], 100),
                    font, 0.7, color, 2)
-        y_offset += 35
         
         # Zones
-        cv2.putText(frame, f"Zones: {len(self.zone_manager.zones)}", (w - 270, y_offset),
+        cv2.putText(frame, f"{len(self.zone_manager.zones)}", (value_x[3], 135),
                    font, 0.7, (255, 255, 255), 2)
     
+    def _build_stats_labels(self):
+        """Pre-rasterize the static stats panel labels (one variant per intruder color)"""
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        texts = ["FPS: ", "Persons: ", "Intruders: ", "Zones: "]
+        
+        self._stats_label_widths = [cv2.getTextSize(text, font, 0.7, 2)[0][0] for text in texts]
+        self._stats_labels = {}
+        
+        for alert in (False, True):
+            colors = [(0, 255, 0), (255, 255, 255),
+                      (0, 0, 255) if alert else (0, 255, 0), (255, 255, 255)]
+            labels = np.zeros_like(self._stats_overlay)
+            mask = np.zeros(labels.shape[:2] + (1,), dtype=np.uint8)
+            
+            for i, (text, color) in enumerate(zip(texts, colors)):
+                y = 30 + 35 * i
+                cv2.putText(labels, text, (10, y), font, 0.7, color, 2)
+                cv2.putText(mask, text, (10, y), font, 0.7, 1, 2)
+            
+            self._stats_labels[alert] = (labels, mask.astype(bool))
+    
     def run(self, video_path: str = None):
         """Run the pipeline on video"""
         video_path = video_path or Config.VIDEO_PATH
@@ -255,53 +346,162 @@ class IntrusionDetectionPipeline:
         print("  'r' - Restart video")
         print("="*60 + "\n")
         
-        paused = False
+        self._stop_event.clear()
+        self._pause_event.clear()
+        self._restart_event.clear()
         
-        while True:
-            if not paused:
-                ret, frame = cap.read()
+        # decode -> detect/track -> display, overlapped across threads.
+        # Detector and tracker only ever run on this (main) thread.
+        read_q = Queue(maxsize=2)
+        show_q = Queue(maxsize=2)
+        
+        # Every frame buffer that can be in flight at once: one being decoded,
+        # one per queue slot, one being processed and one on screen
+        pool_size = read_q.maxsize + show_q.maxsize + 3
+        
+        reader_thread = threading.Thread(
+            target=self._reader_loop, args=(cap, read_q, pool_size), name="reader", daemon=True
+        )
+        display_thread = threading.Thread(
+            target=self._display_loop, args=(show_q,), name="display", daemon=True
+        )
+        reader_thread.start()
+        display_thread.start()
+        
+        try:
+            while not self._stop_event.is_set():
+                if self._pause_event.is_set():
+                    self._stop_event.wait(0.05)
+                    continue
                 
-                if not ret:
-                    print("\n↻ End of video - restarting...")
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                frame = self._get(read_q)
+                if frame is None:
+                    continue
+                
+                if frame is _RESTART or frame is _REWIND:
+                    if frame is _REWIND:
+                        # Don't show frames processed before the rewind
+                        self._drain(show_q)
                     self.frame_count = 0
+                    # Frames already in detector slots belong to the old position
+                    self._batch_count = 0
                     continue
                 
                 # Process frame
                 processed_frame = self.process_frame(frame)
-            
-            else:
-                # Paused - just show frame
-                processed_frame = frame.copy()
-                cv2.putText(processed_frame, "PAUSED - Press 'p' to resume", 
-                           (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 
-                           1, (0, 255, 255), 2)
-            
-            # Display
-            cv2.imshow(Config.WINDOW_NAME, processed_frame)
-            
-            # Keyboard controls
-            key = cv2.waitKey(1) & 0xFF
-            
-            if key == ord('q'):
-                print("\nShutting down...")
-                break
-            
-            elif key == ord('p'):
-                paused = not paused
-                status = "PAUSED" if paused else "RESUMED"
-                print(f"\n{status}")
-            
-            elif key == ord('r'):
-                print("\n↻ Restarting video...")
-                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                self.frame_count = 0
+                self._put(show_q, processed_frame)
+        finally:
+            self._stop_event.set()
+            reader_thread.join()
+            display_thread.join()
         
         # Cleanup
         cap.release()
-        cv2.destroyAllWindows()
         
         print("\n" + "="*60)
         print("Pipeline finished")
         print(f"Total frames processed: {self.frame_count}")
-        print("="*60)
\ No newline at end of file
+        print("="*60)
+    
+    def _reader_loop(self, cap: cv2.VideoCapture, read_q: Queue, pool_size: int):
+        """Decode frames into read_q (reader thread), reusing a ring of frame buffers"""
+        pool = [None] * pool_size
+        slot = 0
+        
+        try:
+            while not self._stop_event.is_set():
+                if self._restart_event.is_set():
+                    self._restart_event.clear()
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    # Frames decoded before the rewind must not reach the tracker
+                    self._drain(read_q)
+                    self._put(read_q, _REWIND)
+                
+                # Decodes into the buffer in place once it has the right shape
+                ret, frame = cap.read(image=pool[slot])
+                
+                if not ret:
+                    print("\n↻ End of video - restarting...")
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    self._put(read_q, _RESTART)
+                    continue
+                
+                pool[slot] = frame
+                slot = (slot + 1) % pool_size
+                self._put(read_q, frame)
+        finally:
+            # Never leave the other stages waiting on a dead thread
+            self._stop_event.set()
+    
+    def _display_loop(self, show_q: Queue):
+        """Show processed frames and handle keyboard controls (display thread)"""
+        try:
+            last_frame = None
+            paused_frame = None
+            
+            while not self._stop_event.is_set():
+                if not self._pause_event.is_set():
+                    try:
+                        last_frame = show_q.get(timeout=0.005)
+                        cv2.imshow(Config.WINDOW_NAME, last_frame)
+                    except Empty:
+                        pass
+                
+                # Keyboard controls
+                key = cv2.waitKey(1) & 0xFF
+                
+                if key == ord('q'):
+                    print("\nShutting down...")
+                    self._stop_event.set()
+                
+                elif key == ord('p'):
+                    if self._pause_event.is_set():
+                        self._pause_event.clear()
+                        print("\nRESUMED")
+                    else:
+                        self._pause_event.set()
+                        print("\nPAUSED")
+                        
+                        if last_frame is not None:
+                            # Paused - just show frame
+                            if paused_frame is None or paused_frame.shape != last_frame.shape:
+                                paused_frame = np.empty_like(last_frame)
+                            np.copyto(paused_frame, last_frame)
+                            cv2.putText(paused_frame, "PAUSED - Press 'p' to resume", 
+                                       (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 
+                                       1, (0, 255, 255), 2)
+                            cv2.imshow(Config.WINDOW_NAME, paused_frame)
+                
+                elif key == ord('r'):
+                    print("\n↻ Restarting video...")
+                    self._restart_event.set()
+        finally:
+            self._stop_event.set()
+            cv2.destroyAllWindows()
+    
+    def _put(self, q: Queue, item) -> bool:
+        """Blocking put that gives up once the pipeline is stopping"""
+        while not self._stop_event.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+    
+    def _drain(self, q: Queue):
+        """Drop everything currently queued in q"""
+        while True:
+            try:
+                q.get_nowait()
+            except Empty:
+                return
+    
+    def _get(self, q: Queue):
+        """Blocking get that returns None once the pipeline is stopping"""
+        while not self._stop_event.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except Empty:
+                continue
+        return None
\ No newline at end of file
@@ -2,42 +2,8 @@
 DeepSORT tracker for person tracking with ID persistence
 """
 import numpy as np
+from scipy.optimize import linear_sum_assignment
 from typing import List, Tuple
-from collections import deque
-
-
-class Track:
-    """Single track object"""
-    
-    _id_counter = 0
-    
-    def __init__(self, bbox: Tuple[int, int, int, int], confidence: float):
-        """
-        Args:
-            bbox: (x1, y1, x2, y2)
-            confidence: Detection confidence
-        """
-        Track._id_counter += 1
-        self.id = Track._id_counter
-        self.bbox = bbox
-        self.confidence = confidence
-        self.age = 0
-        self.hits = 1
-        self.history = deque(maxlen=30)
-        self.history.append(bbox)
-    
-    def update(self, bbox: Tuple[int, int, int, int], confidence: float):
-        """Update track with new detection"""
-        self.bbox = bbox
-        self.confidence = confidence
-        self.hits += 1
-        self.age = 0
-        self.history.append(bbox)
-    
-    def predict(self):
-        """Predict next position (simple: use last position)"""
-        self.age += 1
-        return self.bbox
 
 
 class DeepSORTTracker:
@@ -53,9 +19,15 @@ class DeepSORTTracker:
         self.max_age = max_age
         self.min_hits = min_hits
         self.iou_threshold = iou_threshold
-        self.tracks: List[Track] = []
+        
+        # Track state, one row per track (structure of arrays)
+        self.bboxes = np.empty((0, 4), dtype=np.float32)
+        self.ids = np.empty(0, dtype=np.int32)
+        self.age = np.empty(0, dtype=np.int16)
+        self.hits = np.empty(0, dtype=np.int32)
+        self._next_id = 1
     
-    def update(self, detections: List[Tuple[int, int, int, int, float]]) -> List[Tuple[int, int, int, int, int]]:
+    def update(self, detections: List[Tuple[int, int, int, int, float]]) -> np.ndarray:
         """
         Update tracks with new detections
         
@@ -63,106 +35,91 @@ class DeepSORTTracker:
             detections: List of [(x1, y1, x2, y2, conf), ...]
         
         Returns:
-            List of active tracks: [(x1, y1, x2, y2, track_id), ...]
+            (K, 5) int32 array of active tracks, rows are (x1, y1, x2, y2, track_id)
         """
-        if len(detections) == 0:
-            for track in self.tracks:
-                track.predict()
+        det_bboxes = np.asarray(detections, dtype=np.float32).reshape(-1, 5)[:, :4]
+        
+        # Every track ages; matched ones are reset below
+        self.age += 1
+        
+        if len(det_bboxes) > 0:
+            det_indices, track_indices = self._match_detections_to_tracks(det_bboxes)
             
-            self.tracks = [t for t in self.tracks if t.age <= self.max_age]
+            self.bboxes[track_indices] = det_bboxes[det_indices]
+            self.hits[track_indices] += 1
+            self.age[track_indices] = 0
             
-            active_tracks = []
-            for track in self.tracks:
-                if track.hits >= self.min_hits:
-                    x1, y1, x2, y2 = track.bbox
-                    active_tracks.append((x1, y1, x2, y2, track.id))
+            unmatched = np.ones(len(det_bboxes), dtype=bool)
+            unmatched[det_indices] = False
+            new_bboxes = det_bboxes[unmatched]
+            num_new = len(new_bboxes)
             
-            return active_tracks
-        
-        matched_indices = self._match_detections_to_tracks(detections)
-        
-        unmatched_detections = set(range(len(detections)))
-        unmatched_tracks = set(range(len(self.tracks)))
-        
-        for det_idx, track_idx in matched_indices:
-            bbox = detections[det_idx][:4]
-            conf = detections[det_idx][4]
-            self.tracks[track_idx].update(bbox, conf)
-            unmatched_detections.discard(det_idx)
-            unmatched_tracks.discard(track_idx)
-        
-        for det_idx in unmatched_detections:
-            bbox = detections[det_idx][:4]
-            conf = detections[det_idx][4]
-            self.tracks.append(Track(bbox, conf))
-        
-        for track_idx in unmatched_tracks:
-            self.tracks[track_idx].predict()
-        
-        self.tracks = [t for t in self.tracks if t.age <= self.max_age]
-        
-        active_tracks = []
-        for track in self.tracks:
-            if track.hits >= self.min_hits:
-                x1, y1, x2, y2 = track.bbox
-                active_tracks.append((x1, y1, x2, y2, track.id))
+            if num_new > 0:
+                self.bboxes = np.vstack([self.bboxes, new_bboxes])
+                self.ids = np.concatenate([
+                    self.ids, np.arange(self._next_id, self._next_id + num_new, dtype=np.int32)
+                ])
+                self.age = np.concatenate([self.age, np.zeros(num_new, dtype=np.int16)])
+                self.hits = np.concatenate([self.hits, np.ones(num_new, dtype=np.int32)])
+                self._next_id += num_new
+        
+        alive = self.age <= self.max_age
+        if not alive.all():
+            self.bboxes = self.bboxes[alive]
+            self.ids = self.ids[alive]
+            self.age = self.age[alive]
+            self.hits = self.hits[alive]
+        
+        active = np.where(self.hits >= self.min_hits)[0]
+        active_tracks = np.empty((len(active), 5), dtype=np.int32)
+        active_tracks[:, :4] = self.bboxes[active]
+        active_tracks[:, 4] = self.ids[active]
         
         return active_tracks
     
-    def _match_detections_to_tracks(self, detections: List[Tuple]) -> List[Tuple[int, int]]:
+    def _match_detections_to_tracks(self, det_bboxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Match detections to existing tracks using IOU
+        Match detections to existing tracks using IOU (optimal assignment)
+        
+        Args:
+            det_bboxes: (N, 4) detection bboxes
         
         Returns:
-            List of (detection_index, track_index) pairs
+            (detection_indices, track_indices) arrays of matched pairs
         """
-        if len(self.tracks) == 0:
-            return []
-        
-        iou_matrix = np.zeros((len(detections), len(self.tracks)))
+        if len(self.ids) == 0:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
         
-        for d, det in enumerate(detections):
-            for t, track in enumerate(self.tracks):
-                iou_matrix[d, t] = self._iou(det[:4], track.bbox)
+        iou_matrix = self._iou_matrix(det_bboxes, self.bboxes)
+        iou_matrix[iou_matrix < self.iou_threshold] = 0.0
         
-        matched_indices = []
+        det_indices, track_indices = linear_sum_assignment(-iou_matrix)
+        valid = iou_matrix[det_indices, track_indices] >= self.iou_threshold
         
-        while True:
-            max_iou = iou_matrix.max()
-            
-            if max_iou < self.iou_threshold:
-                break
-            
-            det_idx, track_idx = np.unravel_index(iou_matrix.argmax(), iou_matrix.shape)
-            
-            matched_indices.append((int(det_idx), int(track_idx)))
-            
-            iou_matrix[det_idx, :] = -1
-            iou_matrix[:, track_idx] = -1
-        
-        return matched_indices
+        return det_indices[valid], track_indices[valid]
     
     @staticmethod
-    def _iou(bbox1: Tuple[int, int, int, int], bbox2: Tuple[int, int, int, int]) -> float:
-        """Calculate IOU between two bboxes"""
-        x1_1, y1_1, x2_1, y2_1 = bbox1
-        x1_2, y1_2, x2_2, y2_2 = bbox2
-        
-        x1_i = max(x1_1, x1_2)
-        y1_i = max(y1_1, y1_2)
-        x2_i = min(x2_1, x2_2)
-        y2_i = min(y2_1, y2_2)
+    def _iou_matrix(det_bboxes: np.ndarray, trk_bboxes: np.ndarray) -> np.ndarray:
+        """
+        Calculate pairwise IOU between two sets of bboxes
         
-        if x2_i < x1_i or y2_i < y1_i:
-            return 0.0
+        Args:
+            det_bboxes: (N, 4) array of (x1, y1, x2, y2)
+            trk_bboxes: (M, 4) array of (x1, y1, x2, y2)
         
-        intersection = (x2_i - x1_i) * (y2_i - y1_i)
+        Returns:
+            (N, M) IOU matrix
+        """
+        xx1 = np.maximum(det_bboxes[:, None, 0], trk_bboxes[None, :, 0])
+        yy1 = np.maximum(det_bboxes[:, None, 1], trk_bboxes[None, :, 1])
+        xx2 = np.minimum(det_bboxes[:, None, 2], trk_bboxes[None, :, 2])
+        yy2 = np.minimum(det_bboxes[:, None, 3], trk_bboxes[None, :, 3])
         
-        area1 = (x2_1 - x1_1) * (y2_1 - y1_1)
-        area2 = (x2_2 - x1_2) * (y2_2 - y1_2)
-        union = area1 + area2 - intersection
+        intersection = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
         
-        if union == 0:
-            return 0.0
+        area_d = (det_bboxes[:, 2] - det_bboxes[:, 0]) * (det_bboxes[:, 3] - det_bboxes[:, 1])
+        area_t = (trk_bboxes[:, 2] - trk_bboxes[:, 0]) * (trk_bboxes[:, 3] - trk_bboxes[:, 1])
+        union = area_d[:, None] + area_t[None, :] - intersection
         
-        return intersection / union
\ No newline at end of file
+        return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
\ No newline at end of file
@@ -2,14 +2,16 @@
 Utility modules for the intrusion detection system
 """
 
-from .geometry import point_in_polygon, get_bbox_center, get_bbox_bottom_center, draw_polygon
+from .geometry import (
+    get_bbox_center, get_bbox_bottom_center, get_bboxes_bottom_center, draw_polygon
+)
 from .timer import Timer
 from .drawing import draw_bbox, draw_alarm
 
 __all__ = [
-    'point_in_polygon',
     'get_bbox_center', 
     'get_bbox_bottom_center',
+    'get_bboxes_bottom_center',
     'draw_polygon',
     'Timer',
     'draw_bbox',
@@ -3,7 +3,14 @@ Drawing utilities for visualization
 """
 import cv2
 import numpy as np
-from typing import Tuple
+from typing import Dict, Tuple
+
+# Solid color strips for draw_alarm, keyed by (shape, color)
+_strip_cache: Dict[Tuple, np.ndarray] = {}
+
+# Track ID label sizes for draw_bbox, keyed by track ID
+_label_size_cache: Dict[int, Tuple[int, int]] = {}
+_LABEL_CACHE_LIMIT = 1024
 
 
 def draw_bbox(frame: np.ndarray, bbox: Tuple[int, int, int, int], 
@@ -22,7 +29,13 @@ def draw_bbox(frame: np.ndarray, bbox: Tuple[int, int, int, int],
     
     if track_id is not None:
         label = f"ID: {track_id}"
-        (w, h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)
+        size = _label_size_cache.get(track_id)
+        if size is None:
+            if len(_label_size_cache) >= _LABEL_CACHE_LIMIT:
+                _label_size_cache.clear()
+            size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)[0]
+            _label_size_cache[track_id] = size
+        w, h = size
         cv2.rectangle(frame, (x1, y1 - 20), (x1 + w, y1), color, -1)
         cv2.putText(frame, label, (x1, y1 - 5), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
@@ -40,9 +53,15 @@ def draw_alarm(frame: np.ndarray, message: str = "ALARM!",
     """
     h, w = frame.shape[:2]
     
-    overlay = frame.copy()
-    cv2.rectangle(overlay, (0, 0), (w, 100), color, -1)
-    cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
+    # Blend in place over the banner rows only (rectangle to y=100 inclusive)
+    band = frame[0:101]
+    key = (band.shape, tuple(color))
+    overlay = _strip_cache.get(key)
+    if overlay is None:
+        overlay = np.empty(band.shape, dtype=np.uint8)
+        overlay[:] = color
+        _strip_cache[key] = overlay
+    cv2.addWeighted(overlay, 0.6, band, 0.4, 0, dst=band)
     
     font = cv2.FONT_HERSHEY_SIMPLEX
     text_size = cv2.getTextSize(message, font, 2.5, 4)[0]
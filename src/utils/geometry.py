@@ -6,36 +6,6 @@ import numpy as np
 from typing import List, Tuple
 
 
-def point_in_polygon(point: Tuple[int, int], polygon: List[Tuple[int, int]]) -> bool:
-    """
-    Check if a point is inside a polygon using ray casting algorithm
-    
-    Args:
-        point: (x, y) coordinates
-        polygon: List of (x, y) vertices
-    
-    Returns:
-        True if point is inside polygon
-    """
-    x, y = point
-    n = len(polygon)
-    inside = False
-    
-    p1x, p1y = polygon[0]
-    for i in range(1, n + 1):
-        p2x, p2y = polygon[i % n]
-        if y > min(p1y, p2y):
-            if y <= max(p1y, p2y):
-                if x <= max(p1x, p2x):
-                    if p1y != p2y:
-                        xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                    if p1x == p2x or x <= xinters:
-                        inside = not inside
-        p1x, p1y = p2x, p2y
-    
-    return inside
-
-
 def get_bbox_center(bbox: Tuple[int, int, int, int]) -> Tuple[int, int]:
     """
     Get center point of bounding box
@@ -67,6 +37,22 @@ def get_bbox_bottom_center(bbox: Tuple[int, int, int, int]) -> Tuple[int, int]:
     return center_x, y2
 
 
+def get_bboxes_bottom_center(bboxes: np.ndarray) -> np.ndarray:
+    """
+    Get bottom center points of many bounding boxes at once
+    
+    Args:
+        bboxes: (N, >=4) integer array with (x1, y1, x2, y2) in the first columns
+    
+    Returns:
+        (N, 2) int32 array of (center_x, bottom_y)
+    """
+    points = np.empty((len(bboxes), 2), dtype=np.int32)
+    points[:, 0] = (bboxes[:, 0] + bboxes[:, 2]) >> 1
+    points[:, 1] = bboxes[:, 3]
+    return points
+
+
 def draw_polygon(frame: np.ndarray, polygon: List[Tuple[int, int]], 
                  color: Tuple[int, int, int], thickness: int = 2):
     """
@@ -81,7 +67,7 @@ def draw_polygon(frame: np.ndarray, polygon: List[Tuple[int, int]],
     if len(polygon) < 3:
         return
     
-    pts = np.array(polygon, np.int32)
+    pts = np.asarray(polygon, np.int32)
     pts = pts.reshape((-1, 1, 2))
     cv2.polylines(frame, [pts], isClosed=True, color=color, thickness=thickness)
     
@@ -0,0 +1,48 @@
+"""
+Numba point-in-polygon kernel for batched zone queries
+"""
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def points_in_polygons(xs: np.ndarray, ys: np.ndarray, cells: np.ndarray,
+                       cell_ptr: np.ndarray, cell_zones: np.ndarray,
+                       edges: np.ndarray, edge_offsets: np.ndarray, out: np.ndarray):
+    """
+    Ray casting test of every point against its grid cell's candidate polygons,
+    parallel over points
+
+    Args:
+        xs: (N,) float32 x coordinates
+        ys: (N,) float32 y coordinates
+        cells: (N,) intp flat grid cell index of each point
+        cell_ptr: (C + 1,) intp, cell c's candidates are
+            cell_zones[cell_ptr[c]:cell_ptr[c + 1]]
+        cell_zones: int32 polygon indices whose bounding box overlaps each cell
+        edges: (E, 5) float64 non-horizontal edges of all polygons as
+            (y_min, y_max, x_at_y_min, dx, dy) with dy > 0; the edge crosses
+            row y at x = x_at_y_min + (y - y_min) * dx / dy
+        edge_offsets: (Z + 1,) intp, polygon z owns edges
+            edge_offsets[z]:edge_offsets[z + 1]
+        out: (N,) bool destination, True where the point is in any polygon
+    """
+    for i in prange(xs.shape[0]):
+        x = xs[i]
+        y = ys[i]
+        cell = cells[i]
+        inside = False
+
+        for k in range(cell_ptr[cell], cell_ptr[cell + 1]):
+            z = cell_zones[k]
+            for e in range(edge_offsets[z], edge_offsets[z + 1]):
+                # Same half-open rule as the original ray cast: y_min < y <= y_max and
+                # x <= crossing, cross-multiplied so integer points on an edge are exact
+                if (edges[e, 0] < y <= edges[e, 1] and
+                        (x - edges[e, 2]) * edges[e, 4] <= (y - edges[e, 0]) * edges[e, 3]):
+                    inside = not inside
+            # Parity of a polygon is final once its edges end
+            if inside:
+                break
+
+        out[i] = inside
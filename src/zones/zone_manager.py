@@ -2,12 +2,45 @@
 Zone manager for drawing and managing restricted zones
 """
 import json
+import logging
+import warnings
 import cv2
 import numpy as np
 from typing import List, Tuple, Optional
 from pathlib import Path
 from ..core.config import Config
-from ..utils.geometry import point_in_polygon, draw_polygon
+from ..utils.geometry import draw_polygon
+
+try:
+    from ._pip_numba import points_in_polygons
+except ImportError:  # numba missing, batched queries fall back to shapely
+    points_in_polygons = None
+
+try:
+    import shapely
+except ImportError:  # Optional, only needed for the "shapely" zone backend
+    shapely = None
+
+try:
+    import orjson
+except ImportError:  # Optional, faster zones file I/O
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+_RULE = "=" * 60
+_DRAWING_HELP = """
+%s
+ZONE DRAWING MODE
+%s
+Instructions:
+  - LEFT CLICK: Add point to zone
+  - RIGHT CLICK: Remove last point
+  - PRESS 'c': Complete zone
+  - PRESS 'r': Reset current zone
+  - PRESS 'q': Quit without saving
+%s
+"""
 
 
 class ZoneManager:
@@ -19,87 +52,230 @@ class ZoneManager:
             zones_file: Path to zones JSON file
         """
         self.zones_file = zones_file or str(Config.ZONES_FILE)
-        self.zones: List[List[Tuple[int, int]]] = []
+        self.zones: List[np.ndarray] = []  # (n, 2) int32 vertices per zone
         self.current_zone: List[Tuple[int, int]] = []
+        self._current_pts = np.empty((0, 2), dtype=np.int32)  # current_zone as drawn
+        self._current_zone_dirty = False
         self.drawing_mode = False
+        self._zone_color = Config.ZONE_COLOR
+        self._zone_thickness = Config.ZONE_THICKNESS
+        
+        self.backend = Config.ZONE_BACKEND
+        if self.backend not in ("numba", "shapely", "opencv"):
+            raise ValueError(f"Unknown zone backend: {self.backend}")
+        if self.backend == "numba" and points_in_polygons is None:
+            self.backend = "shapely"
+        if self.backend == "shapely" and shapely is None:
+            self.backend = "opencv"
+        if self.backend != Config.ZONE_BACKEND:
+            log.warning("⚠ Zone backend '%s' not available, using '%s'", Config.ZONE_BACKEND, self.backend)
+        
+        # Per-zone data precomputed by _compile_zones; _contours are in the
+        # (n, 1, 2) int32 layout cv2.pointPolygonTest expects
+        self._zones_xy = np.empty((0, 2), dtype=np.float32)
+        self._zone_offsets = np.zeros(1, dtype=np.int32)
+        self._edges = np.empty((0, 5), dtype=np.float64)
+        self._edge_offsets = np.zeros(1, dtype=np.intp)  # zone z owns edges [z], [z + 1]
+        self._aabbs = np.empty((0, 4), dtype=np.int16)
+        self._grid_cells = Config.ZONE_GRID_CELLS
+        self._grid = np.zeros((0, 0, 0), dtype=bool)  # (Z, rows, cols) zone bbox overlaps cell
+        # CSR form of _grid for the numba kernel: flat cell c's candidate zones
+        # are _cell_zones[_cell_ptr[c]:_cell_ptr[c + 1]]
+        self._cell_ptr = np.zeros(1, dtype=np.intp)
+        self._cell_zones = np.empty(0, dtype=np.int32)
+        self._grid_origin = (0, 0)
+        self._cell_size = (1, 1)
+        self._zone_layer = None  # Lazily built by _build_zone_layer
+        self._mask: Optional[np.ndarray] = None  # (H, W) inside-any-zone LUT, see prepare_mask
+        self._contours: List[np.ndarray] = []
+        self._polygons = []  # shapely backend only
+        self._baked_bg = None  # Drawing UI background with completed zones
         
         # Load existing zones
         self.load_zones()
+        
+        # Compile the batched point-in-polygon kernel up front
+        if self.backend == "numba":
+            points_in_polygons(np.zeros(1, np.float32), np.zeros(1, np.float32),
+                               np.zeros(1, np.intp), np.zeros(2, np.intp),
+                               np.zeros(0, np.int32), np.zeros((0, 5), np.float64),
+                               np.zeros(1, np.intp), np.zeros(1, np.bool_))
     
     def load_zones(self):
         """Load zones from JSON file"""
         if not Path(self.zones_file).exists():
-            print(f"No zones file found at {self.zones_file}")
+            log.info("No zones file found at %s", self.zones_file)
             return
         
         try:
-            with open(self.zones_file, 'r') as f:
-                data = json.load(f)
-                self.zones = [zone['points'] for zone in data.get('zones', [])]
-            print(f"Loaded {len(self.zones)} zone(s) from {self.zones_file}")
+            raw = Path(self.zones_file).read_bytes()
+            data = orjson.loads(raw) if orjson else json.loads(raw)
+            self.zones = [np.asarray(zone['points'], dtype=np.int32).reshape(-1, 2)
+                          for zone in data.get('zones', [])]
+            self._compile_zones()
+            log.info("Loaded %d zone(s) from %s", len(self.zones), self.zones_file)
         except Exception as e:
-            print(f"Error loading zones: {e}")
+            log.error("Error loading zones: %s", e)
     
-    def save_zones(self):
-        """Save zones to JSON file"""
+    def save_zones(self, pretty: bool = None):
+        """
+        Save zones to JSON file
+        
+        Args:
+            pretty: Indent the file for hand editing, defaults to Config.ZONES_PRETTY
+        """
+        if pretty is None:
+            pretty = Config.ZONES_PRETTY
+        
         try:
             data = {
                 'zones': [
-                    {'points': zone, 'id': idx} 
+                    {'points': zone.tolist(), 'id': idx} 
                     for idx, zone in enumerate(self.zones)
                 ]
             }
             
-            with open(self.zones_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            if orjson:
+                raw = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+            elif pretty:
+                raw = json.dumps(data, indent=2).encode()
+            else:
+                raw = json.dumps(data, separators=(',', ':')).encode()
+            Path(self.zones_file).write_bytes(raw)
             
-            print(f"Saved {len(self.zones)} zone(s) to {self.zones_file}")
+            log.info("Saved %d zone(s) to %s", len(self.zones), self.zones_file)
         except Exception as e:
-            print(f"Error saving zones: {e}")
+            log.error("Error saving zones: %s", e)
+    
+    def _compile_zones(self):
+        """Rebuild the flat vertex arrays and everything derived from them; call after any zone change"""
+        # SoA layout: all vertices in one contiguous array, zone z is
+        # _zones_xy[_zone_offsets[z]:_zone_offsets[z + 1]]
+        if self.zones:
+            self._zones_xy = np.concatenate(self.zones).astype(np.float32)
+        else:
+            self._zones_xy = np.empty((0, 2), dtype=np.float32)
+        self._zone_offsets = np.cumsum([0] + [len(zone) for zone in self.zones], dtype=np.int32)
+        vertices = np.split(self._zones_xy, self._zone_offsets[1:-1]) if self.zones else []
+        
+        self._contours = [zone.reshape(-1, 1, 2) for zone in self.zones]
+        self._compile_edges()
+        
+        # (Z, 4) int16 bounding boxes: xmin, ymin, xmax, ymax
+        if self.zones:
+            starts = self._zone_offsets[:-1]
+            self._aabbs = np.hstack([
+                np.minimum.reduceat(self._zones_xy, starts),
+                np.maximum.reduceat(self._zones_xy, starts)
+            ]).astype(np.int16)
+        else:
+            self._aabbs = np.empty((0, 4), dtype=np.int16)
+        self._compile_grid()
+        
+        self._zone_layer = None
+        if self._mask is not None:
+            self.prepare_mask(*self._mask.shape)
+        
+        if self.backend == "shapely":
+            # Prepared geometries let GEOS reuse its edge index across queries
+            self._polygons = [shapely.Polygon(v) for v in vertices]
+            shapely.prepare(self._polygons)
+    
+    def _compile_grid(self):
+        """Bin zone bounding boxes into a uniform grid over the zones' union bounding box"""
+        if len(self._aabbs) == 0:
+            self._grid = np.zeros((0, 0, 0), dtype=bool)
+            self._cell_ptr = np.zeros(1, dtype=np.intp)
+            self._cell_zones = np.empty(0, dtype=np.int32)
+            return
+        
+        aabbs = self._aabbs.astype(np.int64)
+        x0, y0 = aabbs[:, :2].min(axis=0)
+        x1, y1 = aabbs[:, 2:].max(axis=0)
+        cell_w = max(1, -(-(x1 - x0 + 1) // self._grid_cells))
+        cell_h = max(1, -(-(y1 - y0 + 1) // self._grid_cells))
+        
+        # Inclusive cell ranges covered by each zone's bounding box
+        cx0, cx1 = (aabbs[:, 0] - x0) // cell_w, (aabbs[:, 2] - x0) // cell_w
+        cy0, cy1 = (aabbs[:, 1] - y0) // cell_h, (aabbs[:, 3] - y0) // cell_h
+        
+        grid = np.zeros((len(aabbs), cy1.max() + 1, cx1.max() + 1), dtype=bool)
+        for z in range(len(aabbs)):
+            grid[z, cy0[z]:cy1[z] + 1, cx0[z]:cx1[z] + 1] = True
+        
+        # Row-major (cell, zone) pairs, so each cell's zones are contiguous and ascending
+        cells, zones = np.nonzero(grid.reshape(len(aabbs), -1).T)
+        self._cell_ptr = np.zeros(grid[0].size + 1, dtype=np.intp)
+        np.cumsum(np.bincount(cells, minlength=grid[0].size), out=self._cell_ptr[1:])
+        self._cell_zones = zones.astype(np.int32)
+        
+        self._grid = grid
+        self._grid_origin = (x0, y0)
+        self._cell_size = (cell_w, cell_h)
+    
+    def _compile_edges(self):
+        """Precompute ray-cast coefficients of every non-horizontal edge from _zones_xy"""
+        counts = np.diff(self._zone_offsets)
+        
+        # Each vertex pairs with the next one, wrapping around within its zone
+        nxt = np.arange(1, len(self._zones_xy) + 1)
+        nxt[self._zone_offsets[1:] - 1] = self._zone_offsets[:-1]
+        p1 = self._zones_xy.astype(np.float64)
+        p2 = p1[nxt]
+        
+        # Horizontal edges never cross a ray
+        keep = p1[:, 1] != p2[:, 1]
+        p1, p2 = p1[keep], p2[keep]
+        
+        # Orient every edge upwards so dy > 0 and the crossing test needs no division
+        lo = np.where((p1[:, 1] < p2[:, 1])[:, None], p1, p2)
+        hi = np.where((p1[:, 1] < p2[:, 1])[:, None], p2, p1)
+        self._edges = np.stack([
+            lo[:, 1],
+            hi[:, 1],
+            lo[:, 0],
+            hi[:, 0] - lo[:, 0],
+            hi[:, 1] - lo[:, 1]
+        ], axis=1)
+        edge_zone_id = np.repeat(np.arange(len(counts)), counts)[keep]
+        self._edge_offsets = np.searchsorted(edge_zone_id, np.arange(len(counts) + 1))
     
     def start_drawing(self, frame: np.ndarray) -> bool:
         """
         Start interactive zone drawing
         
         Args:
-            frame: First frame for drawing
+            frame: First frame for drawing (read-only, must not be modified
+                by the caller while drawing)
         
         Returns:
             True if drawing was completed
         """
         self.drawing_mode = True
         self.current_zone = []
+        self._current_zone_dirty = True
         
-        print("\n" + "="*60)
-        print("ZONE DRAWING MODE")
-        print("="*60)
-        print("Instructions:")
-        print("  - LEFT CLICK: Add point to zone")
-        print("  - RIGHT CLICK: Remove last point")
-        print("  - PRESS 'c': Complete zone")
-        print("  - PRESS 'r': Reset current zone")
-        print("  - PRESS 'q': Quit without saving")
-        print("="*60 + "\n")
+        log.info(_DRAWING_HELP, _RULE, _RULE, _RULE)
         
         window_name = "Draw Restricted Zone"
         cv2.namedWindow(window_name)
         cv2.setMouseCallback(window_name, self._mouse_callback)
         
-        temp_frame = frame.copy()
+        self._bake_background(frame)
         
         while True:
-            display_frame = temp_frame.copy()
+            display_frame = self._baked_bg.copy()
             
-            for zone in self.zones:
-                draw_polygon(display_frame, zone, (0, 255, 0), 2)
+            # Converted only after the points change, shared by markers and outline
+            if self._current_zone_dirty:
+                self._current_pts = np.asarray(self.current_zone, dtype=np.int32).reshape(-1, 2)
+                self._current_zone_dirty = False
+            pts = self._current_pts
+            for x, y in pts.tolist():
+                cv2.circle(display_frame, (x, y), 5, (0, 0, 255), -1)
             
-            if len(self.current_zone) > 0:
-                for point in self.current_zone:
-                    cv2.circle(display_frame, point, 5, (0, 0, 255), -1)
-                
-                if len(self.current_zone) > 1:
-                    pts = np.array(self.current_zone, np.int32)
-                    cv2.polylines(display_frame, [pts], False, (0, 0, 255), 2)
+            if len(pts) > 1:
+                cv2.polylines(display_frame, [pts], False, (0, 0, 255), 2)
             
             cv2.putText(display_frame, f"Points: {len(self.current_zone)}", 
                        (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
@@ -108,56 +284,234 @@ class ZoneManager:
             
             cv2.imshow(window_name, display_frame)
             
-            key = cv2.waitKey(1) & 0xFF
+            # ~60 Hz is plenty for a click-driven UI
+            key = cv2.waitKey(16) & 0xFF
             
             if key == ord('c'): 
                 if len(self.current_zone) >= 3:
-                    self.zones.append(self.current_zone.copy())
+                    self.zones.append(np.asarray(self.current_zone, dtype=np.int32))
+                    self._compile_zones()
+                    self._bake_background(frame)
                     self.save_zones()
-                    print(f"✓ Zone completed with {len(self.current_zone)} points")
+                    log.info("✓ Zone completed with %d points", len(self.current_zone))
                     self.current_zone = []
+                    self._current_zone_dirty = True
                 else:
-                    print("⚠ Need at least 3 points to create a zone")
+                    log.warning("⚠ Need at least 3 points to create a zone")
             
             elif key == ord('r'):  
                 self.current_zone = []
-                print("↻ Zone reset")
+                self._current_zone_dirty = True
+                log.info("↻ Zone reset")
             
             elif key == ord('q'):  
                 break
         
         cv2.destroyWindow(window_name)
         self.drawing_mode = False
+        self._baked_bg = None
+        self._compile_zones()
         
         return len(self.zones) > 0
     
+    def _bake_background(self, frame: np.ndarray):
+        """Draw completed zones once into the drawing UI background"""
+        self._baked_bg = frame.copy()
+        for zone in self.zones:
+            draw_polygon(self._baked_bg, zone, (0, 255, 0), 2)
+    
     def _mouse_callback(self, event, x, y, flags, param):
         """Mouse callback for zone drawing"""
         if event == cv2.EVENT_LBUTTONDOWN:
             self.current_zone.append((x, y))
-            print(f"+ Point added: ({x}, {y})")
+            self._current_zone_dirty = True
+            log.info("+ Point added: (%d, %d)", x, y)
         
         elif event == cv2.EVENT_RBUTTONDOWN:
             if len(self.current_zone) > 0:
                 removed = self.current_zone.pop()
-                print(f"- Point removed: {removed}")
+                self._current_zone_dirty = True
+                log.info("- Point removed: %s", removed)
     
     def is_point_in_any_zone(self, point: Tuple[int, int]) -> bool:
         """
         Check if point is in any restricted zone
         
+        Deprecated: use contains_points with all points of a frame at once.
+        
         Args:
             point: (x, y) coordinates
         
         Returns:
             True if point is in any zone
         """
-        for zone in self.zones:
-            if point_in_polygon(point, zone):
-                return True
-        return False
+        warnings.warn("is_point_in_any_zone is deprecated, use contains_points",
+                      DeprecationWarning, stacklevel=2)
+        return bool(self.contains_points(np.asarray([point], dtype=np.float32))[0])
+    
+    def are_points_in_any_zone(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Check many points, given as coordinate arrays, against all zones at once
+        
+        Args:
+            xs: (N,) x coordinates
+            ys: (N,) y coordinates
+        
+        Returns:
+            (N,) bool array, True where the point is in any zone
+        """
+        return self.contains_points(np.column_stack([xs, ys]))
+    
+    def contains_points(self, xy: np.ndarray) -> np.ndarray:
+        """
+        Check many points against all restricted zones at once
+        
+        Args:
+            xy: (N, 2) array of (x, y) coordinates, ideally C-contiguous float32
+        
+        Returns:
+            (N,) bool array, True where the point is in any zone
+        """
+        xy = np.ascontiguousarray(xy, dtype=np.float32).reshape(-1, 2)
+        xs, ys = xy[:, 0], xy[:, 1]
+        
+        if self._mask is None or len(xs) == 0:
+            return self._contains_exact(xs, ys)
+        
+        # Mask lookup for points on the frame, exact test only for the rest
+        h, w = self._mask.shape
+        px = np.floor(xs).astype(np.intp)
+        py = np.floor(ys).astype(np.intp)
+        on_frame = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+        if on_frame.all():
+            return self._mask[py, px]
+        
+        inside = np.zeros(len(xs), dtype=bool)
+        inside[on_frame] = self._mask[py[on_frame], px[on_frame]]
+        off_frame = ~on_frame
+        inside[off_frame] = self._contains_exact(xs[off_frame], ys[off_frame])
+        return inside
+    
+    def prepare_mask(self, height: int, width: int):
+        """
+        Rasterize all zones into a frame-sized lookup table for contains_points
+        
+        Meant for a fixed frame size; the mask is rebuilt after every zone change.
+        fillPoly counts every edge pixel as inside, so unlike the exact
+        backends points on a zone's top/left edges are inside too.
+        
+        Args:
+            height: Frame height
+            width: Frame width
+        """
+        mask = np.zeros((height, width), dtype=np.uint8)
+        # One fill per zone: a single multi-contour fillPoly is even-odd and
+        # would leave holes where zones overlap or nest
+        for contour in self._contours:
+            cv2.fillPoly(mask, [contour], 1)
+        self._mask = mask.view(bool)
+    
+    def _contains_exact(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Grid-culled point-in-polygon test with the configured backend"""
+        inside = np.zeros(len(xs), dtype=bool)
+        if len(xs) == 0 or len(self._aabbs) == 0:
+            return inside
+        
+        # Grid lookup: each point's cell lists the zones whose bounding box
+        # overlaps it, points outside the grid have no candidates at all
+        x0, y0 = self._grid_origin
+        cell_w, cell_h = self._cell_size
+        rows, cols = self._grid.shape[1:]
+        cx = np.floor((xs - x0) / cell_w).astype(np.intp)
+        cy = np.floor((ys - y0) / cell_h).astype(np.intp)
+        in_grid = np.flatnonzero((cx >= 0) & (cx < cols) & (cy >= 0) & (cy < rows))
+        cx, cy = cx[in_grid], cy[in_grid]
+        
+        if self.backend == "numba":
+            # One parallel kernel call; each point only walks its cell's candidate zones
+            cells = cy * cols + cx
+            has_zones = self._cell_ptr[cells + 1] > self._cell_ptr[cells]
+            idx, cells = in_grid[has_zones], cells[has_zones]
+            if len(idx) > 0:
+                hits = np.zeros(len(idx), dtype=np.bool_)
+                points_in_polygons(xs[idx], ys[idx], cells, self._cell_ptr, self._cell_zones,
+                                   self._edges, self._edge_offsets, hits)
+                inside[idx] = hits
+            return inside
+        
+        # Exact test only for candidate pairs not already known to be inside
+        for z in range(len(self._grid)):
+            idx = in_grid[self._grid[z, cy, cx] & ~inside[in_grid]]
+            if len(idx) == 0:
+                continue
+            zx, zy = xs[idx], ys[idx]
+            if self.backend == "shapely":
+                hits = shapely.contains_xy(self._polygons[z], zx, zy)
+                on_edge = shapely.intersects_xy(self._polygons[z], zx, zy) & ~hits
+            else:
+                contour = self._contours[z]
+                dist = np.array([cv2.pointPolygonTest(contour, pt, False)
+                                 for pt in zip(zx.tolist(), zy.tolist())])
+                hits = dist > 0
+                on_edge = dist == 0
+            # Points exactly on an edge follow the numba kernel's rule
+            if on_edge.any():
+                hits[on_edge] = self._ray_cast(z, zx[on_edge], zy[on_edge])
+            inside[idx] = hits
+        return inside
+    
+    def _ray_cast(self, z: int, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Ray casting test against zone z's precomputed edges, same rule as the numba kernel
+        
+        An edge counts as crossed when y_min < y <= y_max and x <= its crossing
+        x, so points on a zone's bottom/right edges are inside and points on
+        its top/left edges are outside.
+        """
+        edges = self._edges[self._edge_offsets[z]:self._edge_offsets[z + 1]]
+        x = xs.astype(np.float64)[:, None]
+        y = ys.astype(np.float64)[:, None]
+        crossed = ((edges[:, 0] < y) & (y <= edges[:, 1]) &
+                   ((x - edges[:, 2]) * edges[:, 4] <= (y - edges[:, 0]) * edges[:, 3]))
+        return np.count_nonzero(crossed, axis=1) % 2 == 1
+    
+    def _build_zone_layer(self):
+        """Bake all zone fills into a color layer + mask covering the zones' bounding box"""
+        x0, y0 = self._aabbs[:, :2].min(axis=0).astype(int)
+        x1, y1 = self._aabbs[:, 2:].max(axis=0).astype(int) + 1
+        
+        shape = (y1 - y0, x1 - x0)
+        layer = np.zeros(shape + (3,), dtype=np.uint8)
+        mask = np.zeros(shape, dtype=np.uint8)
+        shifted = [contour - np.array([x0, y0], dtype=np.int32) for contour in self._contours]
+        # Filled one zone at a time, a multi-contour fillPoly is even-odd
+        # and would leave overlapping or nested areas unfilled
+        for contour in shifted:
+            cv2.fillPoly(layer, [contour], self._zone_color)
+            cv2.fillPoly(mask, [contour], 1)
+        
+        self._zone_layer = (x0, y0, layer, mask[:, :, None].astype(bool), np.empty_like(layer))
     
     def draw_zones(self, frame: np.ndarray):
         """Draw all zones on frame"""
-        for zone in self.zones:
-            draw_polygon(frame, zone, Config.ZONE_COLOR, Config.ZONE_THICKNESS)
\ No newline at end of file
+        if not self.zones:
+            return
+        
+        if self._zone_layer is None:
+            self._build_zone_layer()
+        x0, y0, layer, mask, blend = self._zone_layer
+        
+        # Semi-transparent fill: one blend over the zones' bounding box (clipped to frame)
+        h, w = frame.shape[:2]
+        fx0, fy0 = max(x0, 0), max(y0, 0)
+        fx1, fy1 = min(x0 + layer.shape[1], w), min(y0 + layer.shape[0], h)
+        if fx1 > fx0 and fy1 > fy0:
+            roi = frame[fy0:fy1, fx0:fx1]
+            lx, ly = fx0 - x0, fy0 - y0
+            region = (slice(ly, ly + roi.shape[0]), slice(lx, lx + roi.shape[1]))
+            blended = cv2.addWeighted(layer[region], 0.2, roi, 0.8, 0, dst=blend[region])
+            np.copyto(roi, blended, where=mask[region])
+        
+        # Outlines, all zones in one call
+        cv2.polylines(frame, self._contours, isClosed=True, color=self._zone_color,
+                      thickness=self._zone_thickness)
\ No newline at end of file
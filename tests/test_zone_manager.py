@@ -0,0 +1,122 @@
+"""
+Regression checks for ZoneManager point queries
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.zones.zone_manager as zone_manager
+from src.core.config import Config
+from src.zones import ZoneManager
+
+
+def _manager(zones):
+    """ZoneManager over the given zones, backed by a throwaway zones file"""
+    zm = ZoneManager(str(Path(tempfile.mkdtemp()) / "zones.json"))
+    zm.zones = [np.asarray(zone, dtype=np.int32) for zone in zones]
+    zm._compile_zones()
+    return zm
+
+
+def _off_edge_grid(zm, size):
+    """Integer points of a size x size frame, minus those on a zone edge
+
+    The mask and the exact test only disagree about edge pixels.
+    """
+    ys, xs = np.mgrid[0:size, 0:size]
+    pts = np.stack([xs.ravel(), ys.ravel()], axis=1)
+    on_edge = np.zeros(len(pts), dtype=bool)
+    for contour in zm._contours:
+        on_edge |= [cv2.pointPolygonTest(contour, (float(x), float(y)), False) == 0
+                    for x, y in pts.tolist()]
+    return pts[~on_edge].astype(np.float32)
+
+
+def test_mask_matches_exact_for_overlapping_zones():
+    zm = _manager([
+        [(10, 10), (60, 10), (60, 60), (10, 60)],
+        [(40, 40), (90, 40), (90, 90), (40, 90)],
+    ])
+    overlap = np.array([[50, 50]], dtype=np.float32)
+    pts = _off_edge_grid(zm, 100)
+    exact = zm.contains_points(pts)
+    assert zm.contains_points(overlap)[0]
+
+    zm.prepare_mask(100, 100)
+    assert zm.contains_points(overlap)[0]
+    np.testing.assert_array_equal(zm.contains_points(pts), exact)
+
+
+def test_mask_matches_exact_for_nested_zones():
+    zm = _manager([
+        [(5, 5), (95, 5), (95, 95), (5, 95)],
+        [(30, 30), (70, 30), (70, 70), (30, 70)],
+    ])
+    center = np.array([[50, 50]], dtype=np.float32)
+    pts = _off_edge_grid(zm, 100)
+    exact = zm.contains_points(pts)
+    assert zm.contains_points(center)[0]
+
+    zm.prepare_mask(100, 100)
+    assert zm.contains_points(center)[0]
+    np.testing.assert_array_equal(zm.contains_points(pts), exact)
+
+
+def test_zone_fill_covers_overlap():
+    zm = _manager([
+        [(10, 10), (60, 10), (60, 60), (10, 60)],
+        [(40, 40), (90, 40), (90, 90), (40, 90)],
+    ])
+    frame = np.zeros((100, 100, 3), dtype=np.uint8)
+    zm.draw_zones(frame)
+    # Overlap is tinted exactly like a single-zone area
+    np.testing.assert_array_equal(frame[50, 50], frame[20, 20])
+    assert frame[20, 20].any()
+
+
+def _contains_per_backend(monkeypatch, zones, pts):
+    """contains_points results for every backend installed here"""
+    backends = ["opencv"]
+    if zone_manager.points_in_polygons is not None:
+        backends.append("numba")
+    if zone_manager.shapely is not None:
+        backends.append("shapely")
+
+    results = {}
+    for backend in backends:
+        monkeypatch.setattr(Config, "ZONE_BACKEND", backend)
+        results[backend] = _manager(zones).contains_points(pts)
+    return results
+
+
+def test_backends_agree_on_zone_edges(monkeypatch):
+    zones = [
+        [(10, 10), (60, 10), (60, 60), (10, 60)],
+        [(70, 20), (95, 50), (70, 80)],
+    ]
+    ys, xs = np.mgrid[0:100, 0:100]
+    pts = np.stack([xs.ravel(), ys.ravel()], axis=1).astype(np.float32)
+    results = _contains_per_backend(monkeypatch, zones, pts)
+
+    # Original ray-cast rule: bottom/right edges inside, top/left outside
+    for backend, inside in results.items():
+        lookup = dict(zip(map(tuple, pts.astype(int).tolist()), inside.tolist()))
+        assert not lookup[(10, 30)] and not lookup[(30, 10)], backend
+        assert lookup[(60, 30)] and lookup[(30, 60)], backend
+        np.testing.assert_array_equal(inside, results["opencv"], err_msg=backend)
+
+
+def test_slanted_edge_points_match_original_rule(monkeypatch):
+    # Self-intersecting, hand-drawn style zone; the points lie exactly on its
+    # (207, 20)-(272, 98) edge, where a slope/intercept form rounds wrongly
+    zones = [[(289, 38), (272, 98), (207, 20), (227, 12), (274, 33), (270, 105), (232, 76)]]
+    pts = np.array([(207 + 5 * k, 20 + 6 * k) for k in range(1, 13)], dtype=np.float32)
+    expected = [False] * 7 + [True] * 5
+
+    for backend, inside in _contains_per_backend(monkeypatch, zones, pts).items():
+        assert inside.tolist() == expected, backend
\ No newline at end of file